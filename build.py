@@ -1,71 +1,236 @@
 from ninjapie import Env, Generator, SourcePath, BuildPath, BuildEdge, Rule
 
+import functools
+import json
 import os
+import shutil
 import sys
 import subprocess
+import threading
 
 target = os.environ.get('M3_TARGET')
 isa = os.environ.get('M3_ISA', 'x86_64')
 if (target in ['hw', 'hw22', 'hw23']) and isa != 'riscv':
     exit('Unsupport ISA "' + isa + '" for hw')
 
-if isa == 'arm':
-    rustisa = isa
-    rustabi = 'musleabi'
-    cross = 'arm-buildroot-linux-musleabi-'
-    crts0 = ['crt0.o', 'crtbegin.o']
-    crtsn = ['crtend.o']
-elif isa == 'riscv':
-    rustisa = 'riscv64'
-    rustabi = 'musl'
-    cross = 'riscv64-buildroot-linux-musl-'
-    crts0 = ['crt0.o', 'crtbegin.o']
-    crtsn = ['crtend.o']
-else:
-    rustisa = isa
-    rustabi = 'musl'
-    cross = 'x86_64-buildroot-linux-musl-'
-    crts0 = ['crt0.o', 'crt1.o', 'crtbegin.o']
-    crtsn = ['crtend.o', 'crtn.o']
+# the ISA-specific settings
+isas = {
+    'arm': {
+        'rustisa': 'arm',
+        'rustabi': 'musleabi',
+        'muslisa': 'arm',
+        'cross': 'arm-buildroot-linux-musleabi-',
+        'crts0': ['crt0.o', 'crtbegin.o'],
+        'crtsn': ['crtend.o'],
+        'link_addr': 0x1000000,
+        'flags': {
+            'CFLAGS': ['-march=armv7-a'],
+            'CXXFLAGS': ['-march=armv7-a'],
+            'LINKFLAGS': ['-march=armv7-a'],
+            'ASFLAGS': ['-march=armv7-a'],
+        },
+    },
+    'riscv': {
+        'rustisa': 'riscv64',
+        'rustabi': 'musl',
+        'muslisa': 'riscv64',
+        'cross': 'riscv64-buildroot-linux-musl-',
+        'crts0': ['crt0.o', 'crtbegin.o'],
+        'crtsn': ['crtend.o'],
+        'link_addr': 0x11000000,
+        'flags': {
+            'CFLAGS': ['-march=rv64imafdc', '-mabi=lp64d'],
+            'CXXFLAGS': ['-march=rv64imafdc', '-mabi=lp64d'],
+            'LINKFLAGS': ['-march=rv64imafdc', '-mabi=lp64d'],
+            'ASFLAGS': ['-march=rv64imafdc', '-mabi=lp64d'],
+        },
+    },
+    'x86_64': {
+        'rustisa': 'x86_64',
+        'rustabi': 'musl',
+        'muslisa': 'x86_64',
+        'cross': 'x86_64-buildroot-linux-musl-',
+        'crts0': ['crt0.o', 'crt1.o', 'crtbegin.o'],
+        'crtsn': ['crtend.o', 'crtn.o'],
+        'link_addr': 0x1000000,
+        'flags': {
+            # disable red-zone for all applications, because we used the application's stack in
+            # rctmux's IRQ handlers since applications run in privileged mode. TODO can we enable
+            # that now?
+            'CFLAGS': ['-mno-red-zone'],
+            'CXXFLAGS': ['-mno-red-zone'],
+        },
+    },
+}
+if isa not in isas:
+    exit('Unsupported ISA "' + isa + '"')
+
+isa_cfg = isas[isa]
+rustisa = isa_cfg['rustisa']
+rustabi = isa_cfg['rustabi']
+cross = isa_cfg['cross']
+crts0 = isa_cfg['crts0']
+crtsn = isa_cfg['crtsn']
 if os.environ.get('M3_BUILD') == 'coverage':
     rustabi = 'muslcov'
 crossdir = os.path.abspath('build/cross-' + isa + '/host')
 crossver = '11.3.0'
 
-# ensure that the cross compiler is installed and up to date
+
+def _load_json(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_json(path, obj):
+    # write it atomically, because builds for other targets might use the same file
+    tmp = path + '.' + str(os.getpid())
+    with open(tmp, 'w') as f:
+        json.dump(obj, f)
+    os.replace(tmp, path)
+
+
+def _start_dumpversion(crossgcc, st):
+    # the version only changes if the compiler is rebuilt, so remember it along with the stat
+    # information of the binary to avoid running the compiler on every regeneration. if we need to
+    # run it, do that in the background while we set up the environments.
+    key = [crossgcc, st.st_mtime_ns, st.st_size]
+    entry = _load_json(crossgcc_cache).get(crossgcc)
+    if entry is not None and entry['key'] == key:
+        return (key, entry['version'], None)
+
+    cmd = [crossgcc, '-dumpversion']
+    return (key, None, subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL))
+
+
+def _finish_dumpversion(crossgcc, probe):
+    key, ver, proc = probe
+    if proc is None:
+        return ver
+
+    out = proc.communicate()[0]
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    ver = out.decode().strip()
+    entries = _load_json(crossgcc_cache)
+    entries[crossgcc] = {'key': key, 'version': ver}
+    _store_json(crossgcc_cache, entries)
+    return ver
+
+
+# ensure that the cross compiler is installed (the version is checked before the generation)
 crossgcc = crossdir + '/bin/' + cross + 'g++'
-if not os.path.isfile(crossgcc):
+crossgcc_cache = 'build/.crossgcc-version.json'
+crossgcc_probe = None
+try:
+    # a single stat to check for existence and to get the key for the version cache
+    crossgcc_st = os.stat(crossgcc)
+except OSError:
     sys.exit('Please install the ' + isa + ' cross compiler first '
              + '(cd cross && ./build.sh ' + isa + ').')
-else:
-    ver = subprocess.check_output([crossgcc, '-dumpversion']).decode().strip()
-    if ver != crossver:
-        sys.exit('Please update the ' + isa + ' cross compiler from '
-                 + ver + ' to ' + crossver + ' (cd cross && ./build.sh ' + isa + ' clean all).')
+if os.environ.get('M3_OVERRIDE_COMPILER_VERSION_CHECK', '0') != '1':
+    crossgcc_probe = _start_dumpversion(crossgcc, crossgcc_st)
 
+# the stripped binaries per directory in the file system; a dict per directory to install
+# every binary only once (the values are unused)
 bins = {
-    'bin': [],
-    'sbin': [],
+    'bin': {},
+    'sbin': {},
 }
 rustapps = []
 rustlibs = []
 rustfeatures = []
+rustdeps = {}
+globs = {}
 ldscripts = {}
-if isa == 'riscv':
-    link_addr = 0x11000000
-else:
-    link_addr = 0x1000000
+ldflags = {}
+linkdeps = {}
+crtobjs = {}
+memobjs = {}
+link_addr = isa_cfg['link_addr']
+link_addrs = {}
+link_addr_lock = threading.Lock()
+
+
+def _link_addr(out):
+    # every executable gets its own text address; the same executable always gets the same one.
+    # the lock makes sure that this still holds if the generation is ever done in parallel
+    global link_addr
+    with link_addr_lock:
+        if out not in link_addrs:
+            link_addrs[out] = link_addr
+            link_addr += 0x30000
+        return link_addrs[out]
+
+
+@functools.lru_cache(maxsize=None)
+def _sp(path):
+    # the same Cargo.toml files are referenced by many workspaces. the cache lives as long as this
+    # script runs, which is fine for a single generation of build.ninja.
+    return SourcePath(path)
+
+
+@functools.lru_cache(maxsize=None)
+def _exists(path):
+    return os.path.isfile(path)
+
+
+@functools.lru_cache(maxsize=None)
+def _try_execute(cmd):
+    # we are only interested in the exit code; don't collect the output
+    res = subprocess.run(cmd, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return res.returncode == 0
+
+
+def _write_compile_cmds(gen, outdir):
+    # only replace the compile_commands.json if it changed to not trigger a reindexing in clangd
+    tmpdir = outdir + '/.compile-cmds-' + str(os.getpid())
+    os.makedirs(tmpdir, exist_ok=True)
+    gen.write_compile_cmds(outdir=tmpdir)
+    with open(tmpdir + '/compile_commands.json', 'rb') as f:
+        new_cmds = f.read()
+    try:
+        with open(outdir + '/compile_commands.json', 'rb') as f:
+            old_cmds = f.read()
+    except OSError:
+        old_cmds = None
+    if new_cmds != old_cmds:
+        os.replace(tmpdir + '/compile_commands.json', outdir + '/compile_commands.json')
+    else:
+        os.remove(tmpdir + '/compile_commands.json')
+    os.rmdir(tmpdir)
 
 
 class M3Env(Env):
     def clone(self):
-        env = Env.clone(self)
-        if hasattr(self, 'hostenv'):
-            env.hostenv = self.hostenv
+        # like Env.clone, but the variables only hold strings and flat lists or dicts of strings.
+        # copying these one level deep is enough and much cheaper than the deepcopy of Env.clone.
+        # we also bypass the constructor, which would only set up default variables that we
+        # replace anyway; the remaining attributes (current directory, hostenv, ...) are shared.
+        env = object.__new__(type(self))
+        env.__dict__.update(self.__dict__)
+        env._id = self._id + 1
+        env._vars = {
+            k: v.copy() if isinstance(v, (list, dict)) else v for k, v in self._vars.items()
+        }
         return env
 
     def try_execute(self, cmd):
-        return subprocess.getstatusoutput(cmd)[0] == 0
+        return _try_execute(cmd)
+
+    def glob(self, gen, pattern):
+        # clones for different variants often glob the same pattern in the same directory and the
+        # Rust crates are considered by multiple workspaces. the key is the resolved pattern, so
+        # that the same files are globbed only once, regardless of the directory we are in. the
+        # result stays valid for this run, because a changed result triggers a regeneration anyway
+        global globs
+        key = SourcePath.new(self, pattern)
+        if key not in globs:
+            globs[key] = Env.glob(self, gen, pattern)
+        return list(globs[key])
 
     def m3_hex(self, gen, out, input):
         out = BuildPath.new(self, out)
@@ -109,28 +274,38 @@ class M3Env(Env):
             # that occurs now and why only for this symbol.
             libs = baselibs + m3libs + libs + ['c']
 
-        global ldscripts
-        env['LINKFLAGS'] += ['-Wl,-T,' + ldscripts[ldscript]]
-        deps = [ldscripts[ldscript]] + [env['LIBDIR'] + '/' + crt for crt in crts0 + crtsn]
+        global ldscripts, ldflags, linkdeps, crtobjs, memobjs
+        linkflags = [ldflags[ldscript]]
+        # the dependencies and objects below are the same for all executables; create them once.
+        # note that the deps need to stay a list, because ninjapie's BuildEdge copies them.
+        deps_key = (ldscript, env['LIBDIR'])
+        if deps_key not in linkdeps:
+            crts = [env['LIBDIR'] + '/' + crt for crt in crts0 + crtsn]
+            linkdeps[deps_key] = [ldscripts[ldscript]] + crts
+        deps = linkdeps[deps_key]
 
         if varAddr:
-            global link_addr
-            env['LINKFLAGS'] += ['-Wl,--section-start=.text=' + ('0x%x' % link_addr)]
-            link_addr += 0x30000
+            linkflags.append('-Wl,--section-start=.text=' + ('0x%x' % _link_addr(out)))
 
         # we provide our own start files, unless no start files are desired by the app
-        if '-nostartfiles' not in env['LINKFLAGS']:
-            env['LINKFLAGS'] += ['-nostartfiles']
-            crt0_objs = [BuildPath(self['BINDIR'] + '/' + f) for f in crts0]
-            crtn_objs = [BuildPath(self['BINDIR'] + '/' + f) for f in crtsn]
+        startfiles = '-nostartfiles' not in env['LINKFLAGS']
+        if startfiles:
+            linkflags.append('-nostartfiles')
+        env['LINKFLAGS'] = env['LINKFLAGS'] + linkflags
+
+        if startfiles:
+            if self['BINDIR'] not in crtobjs:
+                crtobjs[self['BINDIR']] = (
+                    [BuildPath(self['BINDIR'] + '/' + f) for f in crts0],
+                    [BuildPath(self['BINDIR'] + '/' + f) for f in crtsn],
+                )
+            crt0_objs, crtn_objs = crtobjs[self['BINDIR']]
             ins = crt0_objs + ins + crtn_objs
 
         # TODO workaround to ensure that our memcpy, etc. is used instead of the one from Rust's
         # compiler-builtins crate (or musl), because those are poor implementations.
         fileext = 'sf.o' if env['TRIPLE'].endswith('sf') else 'o'
-        for cc in ['memcmp', 'memcpy', 'memset', 'memmove', 'memzero']:
-            src = SourcePath('src/libs/memory/' + cc + '.cc')
-            ins.append(BuildPath.with_file_ext(env, src, fileext))
+        ins = ins + memobjs[fileext]
 
         bin = env.cxx_exe(gen, out, ins, libs, deps)
         if env['TGT'] in ['hw', 'hw22', 'hw23']:
@@ -140,7 +315,7 @@ class M3Env(Env):
         env.install(gen, env['BINDIR'], bin)
         stripped = env.strip(gen, out=BuildPath(env['BINDIRSTRIP'] + '/' + out), input=bin)
         if dir is not None:
-            bins[dir].append(stripped)
+            bins[dir][stripped] = None
         return bin
 
     def m3_rust_exe(self, gen, out, libs=[], dir='bin', startup=None,
@@ -165,9 +340,9 @@ class M3Env(Env):
         return env.m3_exe(gen, out, ins, libs, dir, True, ldscript, varAddr)
 
     def rust_exe(self, gen, out, deps=[]):
-        deps += env.glob(gen, '**/*.rs') + [SourcePath.new(self, 'Cargo.toml')]
+        deps = deps + self.glob(gen, '**/*.rs') + [SourcePath.new(self, 'Cargo.toml')]
         cfg = SourcePath.new(self, '.cargo/config')
-        if os.path.isfile(cfg):
+        if _exists(cfg):
             deps += [cfg]
         return Env.rust_exe(self, gen, out, deps=deps)
 
@@ -184,15 +359,20 @@ class M3Env(Env):
         self['CRGFLAGS'] += ['--features', 'base/' + self['TGT']]
 
     def rust_deps(self):
-        global rustlibs
-        deps = [SourcePath('src/Cargo.toml'), SourcePath('src/.cargo/config')]
-        deps += [SourcePath('rust-toolchain.toml')]
-        if os.path.isfile('src/toolchain/rust/' + self['TRIPLE'] + '.json'):
-            deps += [SourcePath('src/toolchain/rust/' + self['TRIPLE'] + '.json')]
-        for cr in rustlibs:
-            deps += [SourcePath(cr + '/Cargo.toml')]
-            deps += env.glob(gen, SourcePath(cr + '/**/*.rs'))
-        return deps
+        # the list is the same for all workspaces of a target as long as no library was added
+        global rustlibs, rustdeps
+        key = (self['TRIPLE'], len(rustlibs))
+        if key not in rustdeps:
+            deps = [_sp('src/Cargo.toml'), _sp('src/.cargo/config')]
+            deps += [_sp('rust-toolchain.toml')]
+            if _exists('src/toolchain/rust/' + self['TRIPLE'] + '.json'):
+                deps += [_sp('src/toolchain/rust/' + self['TRIPLE'] + '.json')]
+            for cr in rustlibs:
+                deps += [_sp(cr + '/Cargo.toml')]
+                deps += self.glob(gen, SourcePath(cr + '/**/*.rs'))
+            rustdeps[key] = deps
+        # the callers extend the list
+        return list(rustdeps[key])
 
     def m3_cargo(self, gen, out):
         env = self.clone()
@@ -208,7 +388,7 @@ class M3Env(Env):
         outs = []
         deps = self.rust_deps()
         for cr in rustapps:
-            deps += [SourcePath(cr + '/Cargo.toml')] + env.glob(gen, SourcePath(cr + '/**/*.rs'))
+            deps += [_sp(cr + '/Cargo.toml')] + env.glob(gen, SourcePath(cr + '/**/*.rs'))
             crate_name = os.path.basename(cr)
             outs.append('lib' + crate_name + '.a')
             # specify crates explicitly, because some crates are only supported by some targets
@@ -241,7 +421,7 @@ class M3Env(Env):
         deps += [SourcePath.new(env, 'Cargo.toml'), SourcePath.new(env, '.cargo/config')]
         for o in outs:
             deps += [SourcePath.new(env, o + '/Cargo.toml')]
-            deps += env.glob(gen, SourcePath.new(env, o + '/**/*.rs'))
+            deps += env.glob(gen, o + '/**/*.rs')
 
         env['CRGFLAGS'] += ['--target', env['TRIPLE']]
         env.add_rust_features()
@@ -265,12 +445,20 @@ class M3Env(Env):
         file_env = self.clone()
         file_env['INSTFLAGS'] += ['-m 0644']
 
-        for f in self.glob(gen, dir + '/**/*'):
+        files = self.glob(gen, dir + '/**/*')
+
+        # ninja creates the parent directories of all outputs, so that only empty directories need
+        # to be installed explicitly. this saves a build edge and a process per other directory.
+        parents = {os.path.dirname(f) for f in files}
+
+        for f in files:
             src = SourcePath(f)
             dst = BuildPath.new(self, src)
-            if os.path.isfile(src):
+            if os.path.isfile(f):
                 file_env.install_as(gen, dst, src)
-            elif os.path.isdir(src):
+            elif os.path.isdir(f):
+                if f in parents:
+                    continue
                 dir_env.install_as(gen, dst, src)
             deps += [dst]
 
@@ -312,9 +500,9 @@ if btype == 'debug':
     env['ASFLAGS'] += ['-g']
 else:
     env['CRGFLAGS'] += ['--release']
-    env['CXXFLAGS'] += ['-O2', '-DNDEBUG', '-flto']
-    env['CFLAGS'] += ['-O2', '-DNDEBUG', '-flto']
-    env['LINKFLAGS'] += ['-O2', '-flto']
+    env['CXXFLAGS'] += ['-O2', '-DNDEBUG']
+    env['CFLAGS'] += ['-O2', '-DNDEBUG']
+    env['LINKFLAGS'] += ['-O2']
 if btype == 'bench':
     env['CPPFLAGS'] += ['-Dbench']
 
@@ -336,10 +524,11 @@ env['RUSTLIBS'] = builddir + '/rust/libs'
 hostenv = env.clone()
 hostenv['CXXFLAGS'] += ['-std=c++11']
 hostenv['CPPFLAGS'] += ['-D__tools__']
+
+# use LTO for everything except the host tools
 if btype != 'debug':
-    hostenv.remove_flag('CXXFLAGS', '-flto')
-    hostenv.remove_flag('CFLAGS', '-flto')
-    hostenv.remove_flag('LINKFLAGS', '-flto')
+    for var in ['CXXFLAGS', 'CFLAGS', 'LINKFLAGS']:
+        env[var] += ['-flto']
 
 # for target compilation
 env['CROSS'] = cross
@@ -353,6 +542,11 @@ env['AR'] = cross + 'gcc-ar'
 env['RANLIB'] = cross + 'gcc-ranlib'
 env['STRIP'] = cross + 'strip'
 env['SHLINK'] = cross + 'gcc'
+# use ccache for the compilers if available (crossgcc above stays as is for the version check)
+if os.environ.get('M3_CCACHE', '1') != '0' and shutil.which('ccache'):
+    env['CXX'] = 'ccache ' + env['CXX']
+    env['CC'] = 'ccache ' + env['CC']
+    env['AS'] = 'ccache ' + env['AS']
 
 # basic flags for target compilation
 env['CPPFLAGS'] += ['-D__' + target + '__']
@@ -377,22 +571,9 @@ env.hostenv = hostenv
 env['CXXFLAGS'] += ['-ffreestanding', '-fno-threadsafe-statics']
 env['CPPFLAGS'] += ['-D_GNU_SOURCE']
 env['TRIPLE'] = rustisa + '-linux-m3-' + rustabi
-if isa == 'x86_64':
-    # disable red-zone for all applications, because we used the application's stack in rctmux's
-    # IRQ handlers since applications run in privileged mode. TODO can we enable that now?
-    env['CFLAGS'] += ['-mno-red-zone']
-    env['CXXFLAGS'] += ['-mno-red-zone']
-elif isa == 'arm':
-    env['CFLAGS'] += ['-march=armv7-a']
-    env['CXXFLAGS'] += ['-march=armv7-a']
-    env['LINKFLAGS'] += ['-march=armv7-a']
-    env['ASFLAGS'] += ['-march=armv7-a']
-elif isa == 'riscv':
-    env['CFLAGS'] += ['-march=rv64imafdc', '-mabi=lp64d']
-    env['CXXFLAGS'] += ['-march=rv64imafdc', '-mabi=lp64d']
-    env['LINKFLAGS'] += ['-march=rv64imafdc', '-mabi=lp64d']
-    env['ASFLAGS'] += ['-march=rv64imafdc', '-mabi=lp64d']
-musl_isa = 'riscv64' if isa == 'riscv' else isa
+for var, flags in isa_cfg['flags'].items():
+    env[var] += flags
+musl_isa = isa_cfg['muslisa']
 env['CPPPATH'] += [
     # cross directories only to make clangd happy
     crossdir + '/' + cross[:-1] + '/include/c++/' + crossver,
@@ -404,12 +585,21 @@ env['CPPPATH'] += [
 ]
 # we install the crt* files to that directory
 env['SYSGCCLIBPATH'] = crossdir + '/lib/gcc/' + cross[:-1] + '/' + crossver
-# no build-id because it confuses gem5
-env['LINKFLAGS'] += ['-static', '-Wl,--build-id=none']
-# binaries get very large otherwise
-env['LINKFLAGS'] += ['-Wl,-z,max-page-size=4096', '-Wl,-z,common-page-size=4096']
+env['LINKFLAGS'] += [
+    # no build-id because it confuses gem5
+    '-static', '-Wl,--build-id=none',
+    # binaries get very large otherwise
+    '-Wl,-z,max-page-size=4096', '-Wl,-z,common-page-size=4096',
+]
 env['LIBPATH'] += [crossdir + '/lib', env['LIBDIR']]
 
+# ensure that the cross compiler is up to date
+if crossgcc_probe is not None:
+    ver = _finish_dumpversion(crossgcc, crossgcc_probe)
+    if ver != crossver:
+        sys.exit('Please update the ' + isa + ' cross compiler from '
+                 + ver + ' to ' + crossver + ' (cd cross && ./build.sh ' + isa + ' clean all).')
+
 # start the generation
 gen = Generator()
 
@@ -417,26 +607,52 @@ gen.add_rule('mkm3fs', Rule(
     cmd=env['TOOLDIR'] + '/mkm3fs $out $dir $blocks $inodes 0',
     desc='MKFS $out',
 ))
+gen.add_rule('ldscript', Rule(
+    # only replace the linker script if it changed to not relink all executables (see restat)
+    cmd='$cpp -MD -MF $out.d -MT $out -P $cppflags $in -o $out.tmp'
+        + ' && (cmp -s $out.tmp $out && rm -f $out.tmp || mv -f $out.tmp $out)',
+    deps='gcc',
+    depfile='$out.d',
+    restat=True,
+    desc='CPP $out',
+))
 gen.add_rule('elf2hex', Rule(
     cmd=env['TOOLDIR'] + '/elf2hex $in > $out',
     desc='ELF2HEX $out',
 ))
 
-# generate linker scripts
+# generate linker scripts. the variants only differ in a few defines
 ldscript = 'src/toolchain/ld.conf'
-ldscripts['default'] = env.cpp(gen, out='ld-default.conf', input=ldscript)
-
-bare_env = env.clone()
-bare_env['CPPFLAGS'] += ['-D__baremetal__=1']
-ldscripts['baremetal'] = bare_env.cpp(gen, out='ld-baremetal.conf', input=ldscript)
-
-isr_env = env.clone()
-isr_env['CPPFLAGS'] += ['-D__baremetal__=1', '-D__isr__=1']
-ldscripts['isr'] = isr_env.cpp(gen, out='ld-isr.conf', input=ldscript)
-
-tilemux_env = env.clone()
-tilemux_env['CPPFLAGS'] += ['-D__isr__=1', '-D__tilemux__=1']
-ldscripts['tilemux'] = tilemux_env.cpp(gen, out='ld-tilemux.conf', input=ldscript)
+ldvariants = {
+    'default': [],
+    'baremetal': ['-D__baremetal__=1'],
+    'isr': ['-D__baremetal__=1', '-D__isr__=1'],
+    'tilemux': ['-D__isr__=1', '-D__tilemux__=1'],
+}
+for v, defines in ldvariants.items():
+    ldscripts[v] = BuildPath.new(env, 'ld-' + v + '.conf')
+    gen.add_build(BuildEdge(
+        'ldscript',
+        outs=[ldscripts[v]],
+        ins=[SourcePath(ldscript)],
+        vars={
+            'cpp': env['CPP'],
+            'cppflags': ' '.join(env['CPPFLAGS'] + defines + ['-I' + i for i in env['CPPPATH']]),
+        }
+    ))
+
+for name, path in ldscripts.items():
+    ldflags[name] = '-Wl,-T,' + path
+
+# the object files of our memcpy etc. implementations that are linked into every executable. these
+# are compiled only once by src/libs/memory/build.py. note that we cannot put them into a static
+# library, because the linker would only pull them in for otherwise undefined symbols and would
+# therefore not override the implementations from compiler-builtins or musl.
+for fileext in ['o', 'sf.o']:
+    memobjs[fileext] = []
+    for cc in ['memcmp', 'memcpy', 'memset', 'memmove', 'memzero']:
+        src = SourcePath('src/libs/memory/' + cc + '.cc')
+        memobjs[fileext].append(BuildPath.with_file_ext(env, src, fileext))
 
 # generate build edges
 env.sub_build(gen, 'src')
@@ -446,4 +662,4 @@ if isa == 'riscv' and os.path.exists('src/m3lx/build.py'):
 
 # finally, write it to file
 gen.write_to_file(defaults={})
-gen.write_compile_cmds(outdir='build')
+_write_compile_cmds(gen, 'build')
@@ -0,0 +1,38 @@
+import functools
+import os
+import sys
+
+# the gem5 example configs. abspath does not resolve symlinks and thus needs no system calls. put
+# it in front so that tcu_fs is found immediately, but only once, in case gem5 added it already.
+gem5_configs = os.path.abspath('platform/gem5/configs/example')
+if gem5_configs not in sys.path:
+    sys.path.insert(0, gem5_configs)
+
+import tcu_fs as T  # NOQA
+
+# the settings from the environment (exported by tools/execute.sh), read once for all scripts
+_env = dict(os.environ)
+
+
+class _Settings:
+    # the values are parsed on first use, because not all configurations need them (e.g., aborttest)
+    @functools.cached_property
+    def tiles(self):
+        tiles = _env.get('M3_GEM5_TILES')
+        if tiles is None or not tiles.isdigit():
+            sys.exit('M3_GEM5_TILES needs to be set to the number of core tiles (is '
+                     + repr(tiles) + ')')
+        return int(tiles)
+
+    @functools.cached_property
+    def ide_drive(self):
+        return _env.get('M3_GEM5_IDE_DRIVE')
+
+
+M3 = _Settings()
+
+# the sizes that most of our configurations use. these are passed as strings to the tile creation
+# functions of tcu_fs, which convert them to gem5 parameters.
+CORE_CACHES = {'l1size': '32kB', 'l2size': '256kB'}
+ACCEL_SPM_SIZE = '32MB'
+MEM_SIZE = '3072MB'
@@ -0,0 +1,69 @@
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import chain, count, repeat
+
+from _common import T
+
+
+@dataclass
+class TileSpec:
+    # the kind of tile: core, accel, kecacc, storage, ether, mem, or serial
+    kind: str
+    # the number of tiles of this kind
+    count: int = 1
+    # additional arguments for the create*Tile function
+    kwargs: dict = field(default_factory=dict)
+    # the CPU clock to use for these and all following tiles (unchanged if None)
+    cpu_clock: str = None
+
+
+# the function to create each kind of tile and the arguments that are the same for all such tiles
+_creators = {
+    'core': (T.createCoreTile, {}),
+    'accel': (T.createAccelTile, {'memTile': None}),
+    'kecacc': (T.createKecAccTile, {'cmdline': "", 'memTile': None}),
+    'storage': (T.createStorageTile, {'memTile': None}),
+    'ether': (T.createEtherTile, {'memTile': None}),
+    'mem': (T.createMemTile, {}),
+    'serial': (T.createSerialTile, {'memTile': None}),
+}
+
+
+def build(root, options, specs):
+    # tools/execute.sh passes one command line per core, but treat missing ones as empty
+    cmds = chain(options.cmd.split(","), repeat(""))
+
+    # the core tiles refer to the first memory tile, so determine its id upfront
+    mem_tile = None
+    tile_no = 0
+    for spec in specs:
+        if spec.kind == 'mem':
+            mem_tile = T.TileId(0, tile_no)
+            break
+        tile_no += spec.count
+
+    tiles = []
+    tile_ids = count()
+    for spec in specs:
+        if spec.cpu_clock is not None:
+            options.cpu_clock = spec.cpu_clock
+
+        if spec.kind not in _creators:
+            raise ValueError('Unknown tile kind: ' + spec.kind)
+        func, fixed_args = _creators[spec.kind]
+        create = partial(func, noc=root.noc, options=options, **fixed_args, **spec.kwargs)
+
+        ids = [T.TileId(0, next(tile_ids)) for _ in range(0, spec.count)]
+        if spec.kind == 'core':
+            group = [create(id=id, cmdline=cmd, memTile=mem_tile if cmd != "" else None)
+                     for id, cmd in zip(ids, cmds)]
+        else:
+            group = [create(id=id) for id in ids]
+        tiles.extend(group)
+
+        # connect the ether tiles pairwise with each other
+        if spec.kind == 'ether':
+            for i in range(0, len(group) - 1, 2):
+                T.linkEthertiles(group[i], group[i + 1])
+
+    return tiles
@@ -1,29 +1,27 @@
-import os, sys
+# gem5 puts the directory of the config script into the path
+from _common import MEM_SIZE, T
 
-sys.path.append(os.path.realpath('platform/gem5/configs/example'))
-from tcu_fs import *
-
-options = getOptions()
-root = createRoot(options)
+options = T.getOptions()
+root = T.createRoot(options)
 
 num_tiles = 1
-mem_tile = TileId(0, num_tiles)
+mem_tile = T.TileId(0, num_tiles)
 tiles = []
 
 for i in range(0, num_tiles):
-    tile = createAbortTestTile(noc=root.noc,
-                               options=options,
-                               id=TileId(0, i),
-                               memTile=mem_tile,
-                               spmsize='64MB')
+    tile = T.createAbortTestTile(noc=root.noc,
+                                 options=options,
+                                 id=T.TileId(0, i),
+                                 memTile=mem_tile,
+                                 spmsize='64MB')
     # use 64 bytes as the block size here to test whether it works with multiple memory accesses
     tile.tcu.block_size = "64B"
     tiles.append(tile)
 
-tile = createMemTile(noc=root.noc,
-                     options=options,
-                     id=TileId(0, num_tiles),
-                     size='3072MB')
+tile = T.createMemTile(noc=root.noc,
+                       options=options,
+                       id=T.TileId(0, num_tiles),
+                       size=MEM_SIZE)
 
 tiles.append(tile)
 
@@ -31,4 +29,4 @@ tiles.append(tile)
 # longer amount of time as we need to handle the request on the remote side
 root.noc.width = 64
 
-runSimulation(root, options, tiles)
+T.runSimulation(root, options, tiles)
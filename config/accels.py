@@ -1,57 +1,17 @@
-import os
-import sys
-
-sys.path.append(os.path.realpath('platform/gem5/configs/example'))  # NOQA
-from tcu_fs import *
-
-options = getOptions()
-root = createRoot(options)
-
-cmd_list = options.cmd.split(",")
-
-num_mem = 1
-num_tiles = int(os.environ.get('M3_GEM5_TILES'))
-accs = ['indir', 'indir', 'indir', 'indir', 'copy', 'copy', 'copy', 'copy', 'rot13']
-mem_tile = TileId(0, num_tiles + len(accs))
-
-tiles = []
-
-# create the core tiles
-for i in range(0, num_tiles):
-    tile = createCoreTile(noc=root.noc,
-                          options=options,
-                          id=TileId(0, i),
-                          cmdline=cmd_list[i],
-                          memTile=mem_tile if cmd_list[i] != "" else None,
-                          l1size='32kB',
-                          l2size='256kB')
-    tiles.append(tile)
-
-options.cpu_clock = '1GHz'
-
-# create accelerator tiles
-for i in range(0, len(accs)):
-    tile = createAccelTile(noc=root.noc,
-                           options=options,
-                           id=TileId(0, num_tiles + i),
-                           accel=accs[i],
-                           memTile=None,
-                           spmsize='32MB')
-    tiles.append(tile)
-
-# create the memory tiles
-for i in range(0, num_mem):
-    tile = createMemTile(noc=root.noc,
-                         options=options,
-                         id=TileId(0, num_tiles + len(accs) + i),
-                         size='3072MB')
-    tiles.append(tile)
-
-# create tile for serial input
-tile = createSerialTile(noc=root.noc,
-                        options=options,
-                        id=TileId(0, num_tiles + len(accs) + num_mem),
-                        memTile=None)
-tiles.append(tile)
-
-runSimulation(root, options, tiles)
+# gem5 puts the directory of the config script into the path
+from _common import ACCEL_SPM_SIZE, CORE_CACHES, MEM_SIZE, M3, T
+from _topology import TileSpec, build
+
+options = T.getOptions()
+root = T.createRoot(options)
+
+tiles = build(root, options, [
+    TileSpec('core', M3.tiles, CORE_CACHES),
+    TileSpec('accel', 4, dict(accel='indir', spmsize=ACCEL_SPM_SIZE), cpu_clock='1GHz'),
+    TileSpec('accel', 4, dict(accel='copy', spmsize=ACCEL_SPM_SIZE)),
+    TileSpec('accel', 1, dict(accel='rot13', spmsize=ACCEL_SPM_SIZE)),
+    TileSpec('mem', 1, dict(size=MEM_SIZE)),
+    TileSpec('serial'),
+])
+
+T.runSimulation(root, options, tiles)
@@ -1,81 +1,78 @@
-import os
-import sys
+from itertools import chain, islice, repeat
 
-sys.path.append(os.path.realpath('platform/gem5/configs/example'))  # NOQA
-from tcu_fs import *
+# gem5 puts the directory of the config script into the path
+from _common import CORE_CACHES, MEM_SIZE, M3, T
 
-options = getOptions()
-root = Root(full_system=True)
+options = T.getOptions()
+root = T.Root(full_system=True)
 
-cmd_list = options.cmd.split(",")
+num_tiles = M3.tiles
+# tools/execute.sh passes one command line per core, but treat missing ones as empty
+cmd_list = list(islice(chain(options.cmd.split(","), repeat("")), num_tiles))
+# both chips get the same number of cores
+num_cores_per_chip = num_tiles // 2
+mem_tile = T.TileId(1, num_cores_per_chip)
+
+
+def create_noc():
+    noc = T.IOXBar()
+    noc.frontend_latency = 4
+    noc.forward_latency = 2
+    noc.response_latency = 4
+    return noc
+
+
+def create_bridge(src, dst):
+    # forwards the requests that are not handled in the src NoC to the dst NoC
+    bridge = T.Bridge(delay='50ns')
+    bridge.mem_side_port = dst.cpu_side_ports
+    bridge.cpu_side_port = src.default
+    return bridge
+
+
+def create_cores(noc, chip):
+    cmds = cmd_list[chip * num_cores_per_chip:(chip + 1) * num_cores_per_chip]
+    return [T.createCoreTile(noc=noc,
+                             options=options,
+                             id=T.TileId(chip, i),
+                             cmdline=cmd,
+                             memTile=mem_tile if cmd != "" else None,
+                             **CORE_CACHES)
+            for i, cmd in enumerate(cmds)]
 
-num_mem = 1
-num_tiles = int(os.environ.get('M3_GEM5_TILES'))
-num_cores_per_chip = int(num_tiles / 2)
-mem_tile = TileId(1, num_cores_per_chip)
 
 # Create a top-level voltage domain
-root.voltage_domain = VoltageDomain(voltage=options.sys_voltage)
+root.voltage_domain = T.VoltageDomain(voltage=options.sys_voltage)
 
 # Create a source clock for the system and set the clock period
-root.clk_domain = SrcClockDomain(clock=options.sys_clock,
-                                 voltage_domain=root.voltage_domain)
+root.clk_domain = T.SrcClockDomain(clock=options.sys_clock,
+                                   voltage_domain=root.voltage_domain)
 
 # All tiles are connected to a NoC (Network on Chip). In this case it's just
-# a simple XBar.
-root.noc1 = IOXBar()
-root.noc1.frontend_latency = 4
-root.noc1.forward_latency = 2
-root.noc1.response_latency = 4
-
-root.noc2 = IOXBar()
-root.noc2.frontend_latency = 4
-root.noc2.forward_latency = 2
-root.noc2.response_latency = 4
-
-root.bridge12 = Bridge(delay='50ns')
-root.bridge12.mem_side_port = root.noc2.cpu_side_ports
-root.bridge12.cpu_side_port = root.noc1.default
-
-root.bridge21 = Bridge(delay='50ns')
-root.bridge21.mem_side_port = root.noc1.cpu_side_ports
-root.bridge21.cpu_side_port = root.noc2.default
-
-tiles = []
-
-# create the core tiles
-for i in range(0, num_cores_per_chip):
-    tile = createCoreTile(noc=root.noc1,
-                          options=options,
-                          id=TileId(0, i),
-                          cmdline=cmd_list[i],
-                          memTile=mem_tile if cmd_list[i] != "" else None,
-                          l1size='32kB',
-                          l2size='256kB')
-    tiles.append(tile)
+# a simple XBar per chip and the chips are connected via bridges.
+root.noc1 = create_noc()
+root.noc2 = create_noc()
+root.bridge12 = create_bridge(root.noc1, root.noc2)
+root.bridge21 = create_bridge(root.noc2, root.noc1)
+
+# create the core tiles of the first chip
+tiles = create_cores(root.noc1, 0)
 
 # create tile for serial input
-tile = createSerialTile(noc=root.noc1,
-                        options=options,
-                        id=TileId(0, num_cores_per_chip),
-                        memTile=None)
+tile = T.createSerialTile(noc=root.noc1,
+                          options=options,
+                          id=T.TileId(0, num_cores_per_chip),
+                          memTile=None)
 tiles.append(tile)
 
-for i in range(0, num_cores_per_chip):
-    tile = createCoreTile(noc=root.noc2,
-                          options=options,
-                          id=TileId(1, i),
-                          cmdline=cmd_list[num_cores_per_chip + i],
-                          memTile=mem_tile if cmd_list[num_cores_per_chip + i] != "" else None,
-                          l1size='32kB',
-                          l2size='256kB')
-    tiles.append(tile)
+# create the core tiles of the second chip
+tiles += create_cores(root.noc2, 1)
 
 # create the memory tile
-tile = createMemTile(noc=root.noc2,
-                     options=options,
-                     id=mem_tile,
-                     size='3072MB')
+tile = T.createMemTile(noc=root.noc2,
+                       options=options,
+                       id=mem_tile,
+                       size=MEM_SIZE)
 tiles.append(tile)
 
-runSimulation(root, options, tiles)
+T.runSimulation(root, options, tiles)
@@ -1,43 +1,14 @@
-import os
-import sys
+# gem5 puts the directory of the config script into the path
+from _common import MEM_SIZE, M3, T
+from _topology import TileSpec, build
 
-sys.path.append(os.path.realpath('platform/gem5/configs/example'))  # NOQA
-from tcu_fs import *
+options = T.getOptions()
+root = T.createRoot(options)
 
-options = getOptions()
-root = createRoot(options)
+tiles = build(root, options, [
+    TileSpec('core', M3.tiles, dict(spmsize='64MB')),
+    TileSpec('mem', 1, dict(size=MEM_SIZE)),
+    TileSpec('serial'),
+])
 
-cmd_list = options.cmd.split(",")
-
-num_mem = 1
-num_tiles = int(os.environ.get('M3_GEM5_TILES'))
-mem_tile = TileId(0, num_tiles)
-
-tiles = []
-
-# create the core tiles
-for i in range(0, num_tiles):
-    tile = createCoreTile(noc=root.noc,
-                          options=options,
-                          id=TileId(0, i),
-                          cmdline=cmd_list[i],
-                          memTile=mem_tile if cmd_list[i] != "" else None,
-                          spmsize='64MB')
-    tiles.append(tile)
-
-# create the memory tiles
-for i in range(0, num_mem):
-    tile = createMemTile(noc=root.noc,
-                         options=options,
-                         id=TileId(0, num_tiles + i),
-                         size='3072MB')
-    tiles.append(tile)
-
-# create tile for serial input
-tile = createSerialTile(noc=root.noc,
-                        options=options,
-                        id=TileId(0, num_tiles + num_mem),
-                        memTile=None)
-tiles.append(tile)
-
-runSimulation(root, options, tiles)
+T.runSimulation(root, options, tiles)
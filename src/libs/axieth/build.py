@@ -27,11 +27,8 @@ def build(gen, env):
         ]
 
         env_obj = env.cxx(gen, out='env.o', ins=['env.cc'])
-        files = [env_obj, 'axieth.cc'] + \
-            env.glob(gen, 'common/*.cc') + \
-            env.glob(gen, 'llfifo/*.cc') + \
-            env.glob(gen, 'axidma/*.cc') + \
-            env.glob(gen, 'axiethernet/*.cc')
+        # common, llfifo, axidma and axiethernet
+        files = [env_obj, 'axieth.cc'] + env.glob(gen, '*/*.cc')
         lib = env.static_lib(gen, out='axieth', ins=files)
         env.install(gen, env['LIBDIR'], lib)
 
@@ -7,13 +7,12 @@ def build(gen, env):
 
     files = env.glob(gen, '*.cc')
 
-    # build files manually here to specify the exact file name of the object file. we reference
-    # them later in the configure.py to ensure that we use our own memcpy etc. implementation.
-    for f in files:
-        env.cxx(gen, BuildPath.with_file_ext(env, f, 'o'), [f])
-
-    # same for the soft-float version
+    # soft-float version
     sfenv = env.clone()
     sfenv.soft_float()
+
+    # build files manually here to specify the exact file name of the object file. we reference
+    # them later in build.py (see memobjs) to ensure that we use our own memcpy etc. implementation.
     for f in files:
+        env.cxx(gen, BuildPath.with_file_ext(env, f, 'o'), [f])
         sfenv.cxx(gen, BuildPath.with_file_ext(sfenv, f, 'sf.o'), [f])
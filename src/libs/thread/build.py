@@ -3,9 +3,8 @@ def build(gen, env):
     env['CXXFLAGS'] += ['-fno-exceptions -fno-rtti']
     env['LINKFLAGS'] += ['-fno-exceptions -fno-rtti']
 
-    files = ['Thread.cc', 'ThreadManager.cc']
-    files += ['isa/' + env['ISA'] + '/ThreadSwitch.S']
-    files += ['isa/' + env['ISA'] + '/Thread.cc']
+    isa_dir = 'isa/' + env['ISA'] + '/'
+    files = ['Thread.cc', 'ThreadManager.cc', isa_dir + 'ThreadSwitch.S', isa_dir + 'Thread.cc']
     lib = env.static_lib(gen, out='thread', ins=files)
     env.install(gen, env['LIBDIR'], lib)
     env.install(gen, env['LXLIBDIR'], lib)
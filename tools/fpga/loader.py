@@ -1,4 +1,5 @@
 import os
+import struct
 import sys
 
 from elftools.elf.elffile import ELFFile
@@ -64,8 +65,9 @@ class Loader:
         tile.tcu_set_features(1, self.vm, 1)
 
         # invalidate all EPs
+        invalid_ep = EP.invalid()
         for ep in range(0, 127):
-            tile.tcu_set_ep(ep, EP.invalid())
+            tile.tcu_set_ep(ep, invalid_ep)
 
         # init PMP EP (for loaded tiles or if SPM should be emulated)
         if loaded or not self.vm:
@@ -83,31 +85,29 @@ class Loader:
             tile.tcu_set_ep(0, pmp_ep)
 
     def _load_boot_info(self, tiles: list[pm], dram: memory, mods: list[str], mods_addr: int):
-        # boot info
-        kenv_off = KENV_ADDR
-        utils.write_u64(dram, kenv_off + 0 * 8, len(mods))    # mod_count
-        utils.write_u64(dram, kenv_off + 1 * 8, len(tiles) + 1)  # tile_count
-        utils.write_u64(dram, kenv_off + 2 * 8, 1)            # mem_count
-        utils.write_u64(dram, kenv_off + 3 * 8, 0)            # serv_count
-        kenv_off += 8 * 4
+        # boot info; collected locally and written in one go at the end
+        kenv = bytearray(struct.pack('<4Q',
+                                     len(mods),       # mod_count
+                                     len(tiles) + 1,  # tile_count
+                                     1,               # mem_count
+                                     0))              # serv_count
 
         # mods
         for m in mods:
-            mod_size = self._add_mod(dram, mods_addr, m, kenv_off)
+            mod_size = self._add_mod(dram, mods_addr, m, kenv)
             mods_addr = (mods_addr + mod_size + 4096 - 1) & ~(4096 - 1)
-            kenv_off += 80
 
-        # tile descriptors
-        for x in range(0, len(tiles)):
-            utils.write_u64(dram, kenv_off, self._tile_desc(tiles, x))         # PM
-            kenv_off += 8
-        utils.write_u64(dram, kenv_off, self._tile_desc(tiles, len(tiles)))    # dram1
-        kenv_off += 8
+        # tile descriptors (all PMs and dram1)
+        descs = [self._tile_desc(tiles, x) for x in range(0, len(tiles) + 1)]
+        kenv += struct.pack('<%dQ' % len(descs), *descs)
 
         # mems
         mem_start = mods_addr
-        utils.write_u64(dram, kenv_off + 0, utils.glob_addr(MEM_TILE, mem_start))  # addr
-        utils.write_u64(dram, kenv_off + 8, DRAM_SIZE - mem_start)          # size
+        kenv += struct.pack('<2Q',
+                            utils.glob_addr(MEM_TILE, mem_start),  # addr
+                            DRAM_SIZE - mem_start)                 # size
+
+        dram.mem.write_bytes(KENV_ADDR, bytes(kenv), burst=False)
 
     def _load_prog(self, tiles: list[pm], dram: memory, tile_idx: int,
                    args: list[str], logflags: str):
@@ -146,56 +146,59 @@ class Loader:
         # init environment
         dram_env = ENV + mem_begin - DRAM_OFF
         utils.write_u64(dram, dram_env - 0x1000, 0x0000306f)  # j _start (+0x3000)
-        utils.write_u64(dram, dram_env + 0, 1)           # platform = HW
-        utils.write_u64(dram, dram_env + 8, tile_idx)    # chip, tile
-        utils.write_u64(dram, dram_env + 16, desc)       # tile_desc
-        utils.write_u64(dram, dram_env + 24, len(args))  # argc
-        utils.write_u64(dram, dram_env + 32, argv)       # argv
-        utils.write_u64(dram, dram_env + 40, envp)       # envp
-        utils.write_u64(dram, dram_env + 48, kenv)       # kenv
-        utils.write_u64(dram, dram_env + 56, len(tiles) + 1)  # raw tile count
+        env = [
+            1,               # platform = HW
+            tile_idx,        # chip, tile
+            desc,            # tile_desc
+            len(args),       # argc
+            argv,            # argv
+            envp,            # envp
+            kenv,            # kenv
+            len(tiles) + 1,  # raw tile count
+        ]
         # tile ids
-        env_off = 64
-        for tile in tiles:
-            utils.write_u64(dram, dram_env + env_off, tile.nocid[0] << 8 | tile.nocid[1])
-            env_off += 8
-        utils.write_u64(dram, dram_env + env_off, dram.mem.nocid[0] << 8 | dram.mem.nocid[1])
+        env += [tile.nocid[0] << 8 | tile.nocid[1] for tile in tiles]
+        env += [dram.mem.nocid[0] << 8 | dram.mem.nocid[1]]
+        utils.write_u64s(dram, dram_env, env)
 
         sys.stdout.flush()
 
-    def _add_mod(self, dram: memory, addr: int, mod: str, offset: int) -> int:
+    def _add_mod(self, dram: memory, addr: int, mod: str, kenv: bytearray) -> int:
         (name, path) = mod.split('=')
         path = os.path.basename(path)
-        size = os.path.getsize(path)
-        utils.write_u64(dram, offset + 0x0, utils.glob_addr(MEM_TILE, addr))
-        utils.write_u64(dram, offset + 0x8, size)
-        utils.write_str(dram, name, offset + 16)
-        self._write_file(dram, path, addr)
-        return size
-
-    def _write_file(self, dram: memory, file: str, offset: int):
-        print("%s: loading %s with %u bytes to %#x" %
-              (dram.name, file, os.path.getsize(file), offset))
+        name = name.encode()
+        if len(name) >= 64:
+            sys.exit("Module name {} is too long".format(name.decode()))
+        with open(path, "rb") as f:
+            content = f.read()
+        # address, size, and null-terminated name
+        kenv += struct.pack('<2Q64s', utils.glob_addr(MEM_TILE, addr), len(content), name)
+        self._write_file(dram, path, content, addr)
+        return len(content)
+
+    def _write_file(self, dram: memory, file: str, content: bytes, offset: int):
+        print("%s: loading %s with %u bytes to %#x" % (dram.name, file, len(content), offset))
         sys.stdout.flush()
 
-        with open(file, "rb") as f:
-            content = f.read()
         dram.mem.write_bytes_checked(offset, content, True)
 
     def _write_args(self, dram: memory, args: list[str], argv: int, mem_begin: int) -> int:
         argc = len(args)
         args_addr = argv + (argc + 1) * 8
-        for (idx, a) in enumerate(args, 0):
-            # write pointer
-            utils.write_u64(dram, argv + (mem_begin - DRAM_OFF) + idx * 8, args_addr)
-            # write string
-            utils.write_str(dram, a, args_addr + mem_begin - DRAM_OFF)
-            args_addr += (len(a) + 1 + 7) & ~7
-            if args_addr > ENV + 0x800:
-                sys.exit("Not enough space for arguments")
-        # null termination
-        utils.write_u64(dram, argv + (mem_begin - DRAM_OFF) + argc * 8, 0)
-        return args_addr
+        # collect the pointers and the null-terminated strings, each padded to 8 bytes
+        ptrs = []
+        strs = bytearray()
+        for a in args:
+            ptrs.append(args_addr + len(strs))
+            a = a.encode() + b'\x00'
+            strs += a.ljust((len(a) + 7) & ~7, b'\x00')
+        if args_addr + len(strs) > ENV + 0x800:
+            sys.exit("Not enough space for arguments")
+
+        # write pointers (with null termination) and strings in one go each
+        utils.write_u64s(dram, argv + (mem_begin - DRAM_OFF), ptrs + [0])
+        dram.mem.write_bytes(args_addr + mem_begin - DRAM_OFF, bytes(strs), burst=False)
+        return args_addr + len(strs)
 
     def _tile_desc(self, tiles: list[pm], tile_idx: int):
         if tile_idx >= len(tiles):
@@ -1,3 +1,5 @@
+import struct
+
 from noc import NoCethernet
 
 
@@ -9,17 +11,17 @@ def write_u64(mod, addr: int, value: int):
     mod.mem[addr] = value
 
 
+def write_u64s(mod, addr: int, values: list[int]):
+    # write consecutive words in a single transfer instead of one per word
+    buf = struct.pack('<%dQ' % len(values), *values)
+    mod.mem.write_bytes(addr, buf, burst=False)
+
+
 def read_str(mod, addr: int, length: int) -> str:
     b = mod.mem.read_bytes(addr, length)
     return b.decode()
 
 
-def write_str(mod, string: str, addr: int):
-    buf = bytearray(string.encode())
-    buf += b'\x00'
-    mod.mem.write_bytes(addr, bytes(buf), burst=False)  # TODO enable burst
-
-
 def glob_addr(tile: int, offset: int) -> int:
     return (0x4000 + tile) << 49 | offset
 